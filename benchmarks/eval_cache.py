@@ -0,0 +1,42 @@
+"""
+Compare /eval expression evaluation with and without the compiled
+expression cache. Subexpressions run against MathService directly, so
+no Redis is needed.
+
+Usage:
+    PYTHONPATH=. python benchmarks/eval_cache.py
+"""
+import asyncio
+import time
+
+from services.expression_service import compile_expression, parse_expression
+from services.pycalc_service import MathService
+
+EXPRESSIONS = [
+    "fact(pow(2, 3)) + 1",
+    "fib(90) * 2 - fact(20) / 7",
+    "(1 + 2) * (3 + 4) ** 2 - pow(2, 10) / (5 - 3)",
+    "fib(fact(5)) + fact(fib(10)) - 2 ** 64 + 3 * (4 - 5 * (6 + 7))",
+]
+
+
+async def run(compile_fn, rounds: int) -> float:
+    service = MathService()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for expression in EXPRESSIONS:
+            await compile_fn(expression)(service)
+    return time.perf_counter() - start
+
+
+async def main(rounds: int = 5000):
+    total = rounds * len(EXPRESSIONS)
+    for name, compile_fn in (("uncached", parse_expression),
+                             ("cached", compile_expression)):
+        elapsed = await run(compile_fn, rounds)
+        print(f"{name:<9} {total} evaluations in {elapsed:.3f}s "
+              f"({elapsed / total * 1e6:.1f} us/eval)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""
+Compare payload size and decode time of the JSON and binary operation
+event encodings.
+
+Usage:
+    PYTHONPATH=. python benchmarks/event_encoding.py
+"""
+import timeit
+import uuid
+from datetime import datetime
+
+from streaming.event_codec import decode_event, encode_event
+
+SAMPLE_EVENTS = [
+    {"operation": "fibonacci", "input": "90",
+     "result": 2880067194370816120},
+    {"operation": "factorial", "input": "20",
+     "cached_result": "2432902008176640000"},
+    {"operation": "power", "input": "2.0^10.0", "result": 1024.0},
+    {"operation": "factorial_full", "input": "100000",
+     "result": "<456574 digits>"},
+]
+
+
+def make_events():
+    return [
+        {**event,
+         "timestamp": datetime.utcnow().isoformat(),
+         "user": "bogdan",
+         "event_id": uuid.uuid4().hex}
+        for event in SAMPLE_EVENTS
+    ]
+
+
+def main(rounds: int = 20000):
+    events = make_events()
+    for encoding in ("json", "binary"):
+        encoded = [encode_event(event, encoding) for event in events]
+        size = sum(len(data) for data, _ in encoded) / len(encoded)
+
+        def decode_all():
+            for data, attributes in encoded:
+                decode_event(data, attributes["content_type"])
+
+        seconds = timeit.timeit(decode_all, number=rounds)
+        per_event = seconds / (rounds * len(encoded)) * 1e6
+        print(f"{encoding:<7} {size:6.1f} bytes/event  "
+              f"{per_event:6.2f} us/decode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare calculation throughput of the REST endpoints against the
+pipelined WebSocket channel on a running server.
+
+REST is measured with ``--concurrency`` requests in flight (default 32,
+the WebSocket window) and with one at a time. Each client warms the
+result cache first, so both sides are served from Redis.
+
+Usage:
+    python benchmarks/ws_vs_rest.py --url http://localhost:8080 \
+        --username bogdan --password bogdan --requests 500
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import httpx
+import websockets
+
+# Same as routers.ws_router.MAX_IN_FLIGHT
+WS_WINDOW = 32
+
+OPERATIONS = [
+    ("fibonacci", [90]),
+    ("factorial", [50]),
+    ("pow", [2, 10]),
+]
+
+
+async def login(client: httpx.AsyncClient, username: str,
+                password: str) -> str:
+    response = await client.post(
+        "/login", json={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def rest_path(op: str, args: list) -> str:
+    return "/" + "/".join([op] + [str(a) for a in args])
+
+
+async def bench_rest(client: httpx.AsyncClient, token: str, total: int,
+                     concurrency: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    calls = itertools.islice(itertools.cycle(OPERATIONS), total)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def call(op, args):
+        async with limit:
+            response = await client.get(rest_path(op, args), headers=headers)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(op, args) for op, args in calls))
+    return time.perf_counter() - start
+
+
+async def bench_ws(url: str, token: str, total: int) -> float:
+    ws_url = url.replace("http", "ws", 1) + "/ws/calc"
+    headers = {"Authorization": f"Bearer {token}"}
+    calls = itertools.islice(itertools.cycle(OPERATIONS), total)
+    start = time.perf_counter()
+    async with websockets.connect(ws_url, additional_headers=headers) as ws:
+        async def sender():
+            for tag, (op, args) in enumerate(calls):
+                await ws.send(json.dumps({"id": tag, "op": op, "args": args}))
+
+        send_task = asyncio.create_task(sender())
+        for _ in range(total):
+            reply = json.loads(await ws.recv())
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+        await send_task
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=WS_WINDOW)
+    options = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=options.url, timeout=30) as client:
+        token = await login(client, options.username, options.password)
+        await bench_rest(client, token, len(OPERATIONS), 1)
+        await bench_ws(options.url, token, len(OPERATIONS))
+        timings = [
+            (f"REST c={options.concurrency}", await bench_rest(
+                client, token, options.requests, options.concurrency)),
+            ("REST c=1", await bench_rest(
+                client, token, options.requests, 1)),
+        ]
+    timings.append((f"WS w={WS_WINDOW}", await bench_ws(
+        options.url, token, options.requests)))
+
+    for name, elapsed in timings:
+        print(f"{name:<10} {options.requests} requests in {elapsed:.3f}s "
+              f"({options.requests / elapsed:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
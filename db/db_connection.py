@@ -9,6 +9,16 @@ async def get_db():
 
 async def init_db():
     async with aiosqlite.connect(DB_FILE) as db:
+        # Free pages are reclaimed by the maintenance task through
+        # PRAGMA incremental_vacuum. Switching an existing database to
+        # incremental mode needs one full VACUUM.
+        cursor = await db.execute("PRAGMA auto_vacuum")
+        auto_vacuum = (await cursor.fetchone())[0]
+        await cursor.close()
+        if auto_vacuum != 2:
+            await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await db.execute("VACUUM")
+
         await db.execute("""
             CREATE TABLE IF NOT EXISTS operations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -19,6 +29,15 @@ async def init_db():
                 user_id INTEGER
             )
         """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS operations_daily (
+                day DATE NOT NULL,
+                user_id INTEGER NOT NULL,
+                operation TEXT NOT NULL,
+                operation_count INTEGER NOT NULL,
+                PRIMARY KEY (day, user_id, operation)
+            )
+        """)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
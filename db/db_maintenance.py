@@ -0,0 +1,83 @@
+import asyncio
+import os
+from db.db_connection import get_db
+
+RETENTION_DAYS = int(os.getenv("OPERATIONS_RETENTION_DAYS", "30"))
+MAINTENANCE_INTERVAL_SECONDS = int(
+    os.getenv("MAINTENANCE_INTERVAL_SECONDS", "3600")
+)
+ROLLUP_BATCH_SIZE = int(os.getenv("ROLLUP_BATCH_SIZE", "500"))
+VACUUM_PAGES = int(os.getenv("INCREMENTAL_VACUUM_PAGES", "200"))
+
+
+async def roll_up_operations(
+        retention_days: int = RETENTION_DAYS,
+        batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """
+    Fold operations older than ``retention_days`` into ``operations_daily``
+    and delete the raw rows.
+
+    Each batch is its own short transaction, so request handlers writing
+    to ``operations`` only ever wait for one batch.
+    Returns the number of raw rows rolled up.
+    """
+    rolled_up = 0
+    db = await get_db()
+    try:
+        while True:
+            cursor = await db.execute(
+                "SELECT id FROM operations "
+                "WHERE timestamp < datetime('now', ?) ORDER BY id LIMIT ?",
+                (f"-{retention_days} days", batch_size)
+            )
+            ids = [row[0] for row in await cursor.fetchall()]
+            await cursor.close()
+            if not ids:
+                break
+
+            placeholders = ",".join("?" * len(ids))
+            await db.execute(
+                "INSERT INTO operations_daily "
+                "(day, user_id, operation, operation_count) "
+                "SELECT date(timestamp), COALESCE(user_id, 0), operation, "
+                "COUNT(*) FROM operations "
+                f"WHERE id IN ({placeholders}) "
+                "GROUP BY date(timestamp), COALESCE(user_id, 0), operation "
+                "ON CONFLICT (day, user_id, operation) DO UPDATE SET "
+                "operation_count = operation_count + excluded.operation_count",
+                ids
+            )
+            await db.execute(
+                f"DELETE FROM operations WHERE id IN ({placeholders})", ids
+            )
+            await db.commit()
+            rolled_up += len(ids)
+            # Give queued writers a chance between batches.
+            await asyncio.sleep(0.05)
+    finally:
+        await db.close()
+    return rolled_up
+
+
+async def incremental_vacuum(pages: int = VACUUM_PAGES):
+    db = await get_db()
+    try:
+        # The pragma frees one page per step, so the cursor must be drained.
+        cursor = await db.execute(f"PRAGMA incremental_vacuum({int(pages)})")
+        await cursor.fetchall()
+        await cursor.close()
+    finally:
+        await db.close()
+
+
+async def run_maintenance(
+        interval_seconds: int = MAINTENANCE_INTERVAL_SECONDS):
+    while True:
+        try:
+            rolled_up = await roll_up_operations()
+            if rolled_up:
+                print(f"Rolled up {rolled_up} operations into daily totals.")
+            await incremental_vacuum()
+        except Exception as e:
+            print(f"Error during database maintenance: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -4,7 +4,10 @@ from fastapi import FastAPI
 import uvicorn
 from routers.pycalc_routers import router as math_router
 from routers.auth_router import router as auth_router
+from routers.bignum_router import router as bignum_router
+from routers.ws_router import router as ws_router
 from db.db_connection import init_db
+from db.db_maintenance import run_maintenance
 from prometheus_fastapi_instrumentator import Instrumentator
 from streaming.pubsub_consumer import consume
 from streaming.kafka_storage import get_kafka_messages
@@ -18,14 +21,18 @@ async def lifespan(_: FastAPI):
     loop.run_in_executor(None, consume)
 
     print("Pub/Sub consumer started.")
+    maintenance = asyncio.create_task(run_maintenance())
     try:
         yield
     finally:
+        maintenance.cancel()
         print("Application shutdown.")
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(math_router)
 app.include_router(auth_router)
+app.include_router(bignum_router)
+app.include_router(ws_router)
 
 
 @app.get("/kafka")
@@ -1,8 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Any
+from services.expression_service import MAX_EXPRESSION_LENGTH
 
 
 class MathResult(BaseModel):
     operation: str
     input: Any
     result: Any
+
+
+class ExpressionRequest(BaseModel):
+    expression: str = Field(max_length=MAX_EXPRESSION_LENGTH)
@@ -93,11 +93,8 @@ async def login(user: UserLogin):
 security = HTTPBearer()
 
 
-def verify_token(
-        credentials: HTTPAuthorizationCredentials = Depends(security)
-):
+def decode_token(token: str) -> str:
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload["sub"]
     except jwt.ExpiredSignatureError:
@@ -112,6 +109,12 @@ def verify_token(
         )
 
 
+def verify_token(
+        credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    return decode_token(credentials.credentials)
+
+
 @router.get("/secure-history")
 async def get_secure_history(current_user: str = Depends(verify_token)):
     """
@@ -152,6 +155,49 @@ async def get_secure_history(current_user: str = Depends(verify_token)):
     return {"user": current_user, "role": role, "history": rows}
 
 
+@router.get("/secure-history/aggregates")
+async def get_secure_history_aggregates(
+        current_user: str = Depends(verify_token)
+):
+    """
+    Get daily operation totals for history older than the retention window.
+
+    - **Access**:
+        - Admins: see totals for all users
+        - Normal users: see only their own totals
+    - **Returns**: JSON with user, role, and list of totals
+      (operation, day, count)
+    - **Requires**: JWT Bearer Token
+    """
+    db = await get_db()
+
+    cursor = await db.execute(
+        "SELECT role, id FROM users WHERE username=?",
+        (current_user,)
+    )
+    user = await cursor.fetchone()
+    if not user:
+        await db.close()
+        raise HTTPException(status_code=401, detail="User not found")
+    role, user_id = user
+
+    if role == "admin":
+        cursor = await db.execute(
+            "SELECT operation, day, operation_count, user_id "
+            "FROM operations_daily ORDER BY day DESC")
+    else:
+        cursor = await db.execute(
+            "SELECT operation, day, operation_count "
+            "FROM operations_daily "
+            "WHERE user_id=? ORDER BY day DESC", (user_id, )
+        )
+
+    rows = await cursor.fetchall()
+    await cursor.close()
+    await db.close()
+    return {"user": current_user, "role": role, "history": rows}
+
+
 @router.delete("/delete-user/{username}")
 async def delete_user(
         username: str,
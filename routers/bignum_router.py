@@ -0,0 +1,144 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from models.pycalc_models import MathResult
+from routers.auth_router import verify_token
+from services.bignum_service import (
+    BigNumberService,
+    iter_decimal_chunks,
+    iter_hex_chunks,
+)
+from routers.cached_operation import record_operation, run_cached
+import time
+
+router = APIRouter(prefix="/big")
+
+MAX_FULL_FACTORIAL_N = 100_000
+MAX_FULL_FIBONACCI_N = 1_000_000
+MAX_MODULAR_FACTORIAL_N = 1_000_000
+MAX_ANALYTIC_N = 10 ** 15
+
+BigMode = Literal["full", "digits", "mod", "zeros"]
+BigBase = Literal["dec", "hex"]
+
+
+def _stream(value: int, base: str, digits: int) -> StreamingResponse:
+    chunks = iter_hex_chunks(value) if base == "hex" \
+        else iter_decimal_chunks(value)
+    return StreamingResponse(
+        chunks,
+        media_type="text/plain",
+        headers={"X-Decimal-Digits": str(digits)}
+    )
+
+
+async def _cached_scalar(operation: str, input_data: str, user: str,
+                         compute) -> MathResult:
+    result = await run_cached(operation, input_data, user, compute)
+    return MathResult(operation=operation, input=input_data, result=result)
+
+
+def _check_limit(n: int, limit: int):
+    if n < 0:
+        raise HTTPException(400, "n must be a non-negative integer")
+    if n > limit:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Input too large. Please use a value <= {limit}."
+        )
+
+
+@router.get("/factorial/{n}")
+async def get_big_factorial(
+        n: int,
+        mode: BigMode = "full",
+        base: BigBase = "dec",
+        m: Optional[int] = None,
+        algorithm: Literal["split", "swing"] = "split",
+        current_user: str = Depends(verify_token),
+        service: BigNumberService = Depends()
+):
+    """
+        Compute very large factorials, or properties of them.
+
+        - **mode=full**: stream `n!` as text in `dec` or `hex` chunks
+          (n max 100000)
+        - **mode=digits**: number of decimal digits of `n!`
+        - **mode=mod**: `n! mod m` (requires `m`, n max 1000000)
+        - **mode=zeros**: trailing decimal zeros of `n!`
+        - **algorithm**: `split` (binary splitting) or `swing` (prime swing)
+        - **Requires**: JWT access token
+    """
+    if mode == "full":
+        _check_limit(n, MAX_FULL_FACTORIAL_N)
+        start = time.perf_counter()
+        result = await service.factorial(n, algorithm)
+        end = time.perf_counter()
+        print(f"Big factorial calculation took {end - start:.4f} seconds")
+        digits = await service.factorial_digits(n)
+        await record_operation("factorial_full", str(n), f"<{digits} digits>",
+                               current_user)
+        return _stream(result, base, digits)
+
+    if mode == "mod":
+        _check_limit(n, MAX_MODULAR_FACTORIAL_N)
+        if m is None or m < 1:
+            raise HTTPException(400, "mode=mod requires a positive modulus m")
+        return await _cached_scalar(
+            "factorial_mod", f"{n}:{m}", current_user,
+            lambda: service.factorial_mod(n, m)
+        )
+
+    _check_limit(n, MAX_ANALYTIC_N)
+    if mode == "digits":
+        return await _cached_scalar(
+            "factorial_digits", str(n), current_user,
+            lambda: service.factorial_digits(n)
+        )
+    return await _cached_scalar(
+        "factorial_zeros", str(n), current_user,
+        lambda: service.factorial_trailing_zeros(n)
+    )
+
+
+@router.get("/fibonacci/{n}")
+async def get_big_fibonacci(
+        n: int,
+        mode: Literal["full", "digits", "mod"] = "full",
+        base: BigBase = "dec",
+        m: Optional[int] = None,
+        current_user: str = Depends(verify_token),
+        service: BigNumberService = Depends()
+):
+    """
+        Compute very large Fibonacci numbers by fast doubling.
+
+        - **mode=full**: stream `F(n)` as text in `dec` or `hex` chunks
+          (n max 1000000)
+        - **mode=digits**: number of decimal digits of `F(n)`
+        - **mode=mod**: `F(n) mod m` (requires `m`)
+        - **Requires**: JWT access token
+    """
+    if mode == "full":
+        _check_limit(n, MAX_FULL_FIBONACCI_N)
+        start = time.perf_counter()
+        result = await service.fibonacci(n)
+        end = time.perf_counter()
+        print(f"Big fibonacci calculation took {end - start:.4f} seconds")
+        digits = await service.fibonacci_digits(n)
+        await record_operation("fibonacci_full", str(n), f"<{digits} digits>",
+                               current_user)
+        return _stream(result, base, digits)
+
+    _check_limit(n, MAX_ANALYTIC_N)
+    if mode == "mod":
+        if m is None or m < 1:
+            raise HTTPException(400, "mode=mod requires a positive modulus m")
+        return await _cached_scalar(
+            "fibonacci_mod", f"{n}:{m}", current_user,
+            lambda: service.fibonacci_mod(n, m)
+        )
+    return await _cached_scalar(
+        "fibonacci_digits", str(n), current_user,
+        lambda: service.fibonacci_digits(n)
+    )
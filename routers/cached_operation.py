@@ -0,0 +1,71 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+from db.db_repository import insert_operation
+from cache.redis_cache import get_cached_result, set_cached_result
+
+from streaming.pubsub_producer import send_message
+
+CACHE_EXPIRE_SECONDS = 3600
+
+
+async def _publish(operation: str, input_data: str, key: str, value,
+                   user: str):
+    await asyncio.to_thread(send_message, {
+        "operation": operation,
+        "input": input_data,
+        key: value,
+        "timestamp": datetime.utcnow().isoformat(),
+        "user": user
+    })
+
+
+async def record_operation(operation: str, input_data: str, result,
+                           user: str, *,
+                           history_operation: Optional[str] = None,
+                           dumps: Callable[[Any], str] = str):
+    """Store an operation in the history and publish it on the stream.
+
+    The history keeps ``dumps(result)``; the event carries ``result`` as is.
+    """
+    await insert_operation(history_operation or operation, input_data,
+                           dumps(result), user)
+    await _publish(operation, input_data, "result", result, user)
+
+
+async def run_cached(operation: str, input_data: str, user: str,
+                     compute: Callable[[], Awaitable[Any]], *,
+                     cache_key: Optional[str] = None,
+                     history_operation: Optional[str] = None,
+                     dumps: Callable[[Any], str] = str,
+                     loads: Callable[[str], Any] = int,
+                     record: bool = True):
+    """
+    Return ``compute()`` through the Redis cache.
+
+    Results are cached as ``dumps(result)`` under ``cache_key`` (default
+    ``"<operation>:<input_data>"``) and read back with ``loads``. With
+    ``record`` set, hits are published as ``cached_result`` events and
+    misses go through ``record_operation``.
+    """
+    cache_key = cache_key or f"{operation}:{input_data}"
+    cached_result = await get_cached_result(cache_key)
+    if cached_result:
+        print(f"Cache hit for {operation}({input_data})")
+        if record:
+            await _publish(operation, input_data, "cached_result",
+                           cached_result, user)
+        return loads(cached_result)
+
+    start = time.perf_counter()
+    result = await compute()
+    end = time.perf_counter()
+    print(f"{operation} calculation took {end - start:.4f} seconds")
+    await set_cached_result(cache_key, dumps(result),
+                            expire=CACHE_EXPIRE_SECONDS)
+    if record:
+        await record_operation(operation, input_data, result, user,
+                               history_operation=history_operation,
+                               dumps=dumps)
+    return result
@@ -1,16 +1,24 @@
+import json
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
-from models.pycalc_models import MathResult
+from models.pycalc_models import ExpressionRequest, MathResult
 from routers.auth_router import verify_token
 from services.pycalc_service import MathService
+from services.expression_service import compile_expression
 from db.db_repository import insert_operation
 from cache.redis_cache import get_cached_result, set_cached_result
+from routers.cached_operation import record_operation, run_cached
 import time
 
 from streaming.pubsub_producer import send_message
 
 router = APIRouter()
 
+MAX_FIBONACCI_N = 500
+MAX_FACTORIAL_N = 100
+MAX_POWER_OPERAND = 100
+MAX_PRIME_INPUT = 2 ** 64
+
 
 @router.get("/fibonacci/{n}", response_model=MathResult)
 async def get_fibonacci(
@@ -24,10 +32,10 @@ async def get_fibonacci(
         - **Returns**: Fibonacci result
         - **Uses**: Redis cache, Pub/Sub, JWT Auth
         """
-    if n > 500:
+    if n > MAX_FIBONACCI_N:
         raise HTTPException(
             status_code=400,
-            detail="Input too large. Please use a value <= 500."
+            detail=f"Input too large. Please use a value <= {MAX_FIBONACCI_N}."
         )
 
     # Check cache first
@@ -74,10 +82,10 @@ async def get_factorial(
         - **Returns**: result of `n!` and operation metadata
         - **Requires**: JWT access token
     """
-    if n > 100:
+    if n > MAX_FACTORIAL_N:
         raise HTTPException(
             status_code=400,
-            detail="Input too large. Please use a value <= 100."
+            detail=f"Input too large. Please use a value <= {MAX_FACTORIAL_N}."
         )
 
     # Check cache first
@@ -128,7 +136,7 @@ async def get_power(
         - **Returns**: x ** y
         - **Cached**: result saved in Redis for faster lookup
     """
-    if abs(x) > 100 or abs(y) > 100:
+    if abs(x) > MAX_POWER_OPERAND or abs(y) > MAX_POWER_OPERAND:
         raise HTTPException(400, "Base and exponent must be between -100 and 100")
 
     input_data = f"{x}^{y}" if y != 1 else str(x)
@@ -168,3 +176,143 @@ async def get_power(
         input={"base": x, "exponent": y},
         result=result
     )
+
+
+async def _run_cached(operation: str, n: int, current_user: str, compute):
+    """Cache, history and stream handling shared by the prime endpoints.
+
+    Results are cached as JSON so lists and booleans round-trip.
+    """
+    try:
+        result = await run_cached(operation, str(n), current_user, compute,
+                                  dumps=json.dumps, loads=json.loads)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return MathResult(operation=operation, input=n, result=result)
+
+
+@router.get("/is-prime/{n}", response_model=MathResult)
+async def get_is_prime(
+        n: int, current_user: str = Depends(verify_token),
+        service: MathService = Depends()
+):
+    """
+        Test whether a number is prime.
+
+        - **n**: integer below 2^64
+        - **Returns**: `true` or `false`
+        - **Uses**: shared prime sieve, Miller-Rabin above the sieve
+    """
+    if n >= MAX_PRIME_INPUT:
+        raise HTTPException(400, "Input too large. Please use a value < 2^64.")
+    return await _run_cached(
+        "is_prime", n, current_user, lambda: service.is_prime(n)
+    )
+
+
+@router.get("/nth-prime/{n}", response_model=MathResult)
+async def get_nth_prime(
+        n: int, current_user: str = Depends(verify_token),
+        service: MathService = Depends()
+):
+    """
+        Find the n-th prime number (`nth-prime/1` is 2).
+
+        - **n**: positive integer, bounded by the sieve size
+        - **Returns**: the n-th prime
+    """
+    if n < 1:
+        raise HTTPException(400, "n must be a positive integer")
+    return await _run_cached(
+        "nth_prime", n, current_user, lambda: service.nth_prime(n)
+    )
+
+
+@router.get("/prime-count/{n}", response_model=MathResult)
+async def get_prime_count(
+        n: int, current_user: str = Depends(verify_token),
+        service: MathService = Depends()
+):
+    """
+        Count the primes less than or equal to n.
+
+        - **n**: non-negative integer, bounded by the sieve size
+        - **Returns**: number of primes `<= n`
+    """
+    if n < 0:
+        raise HTTPException(400, "n must be a non-negative integer")
+    return await _run_cached(
+        "prime_count", n, current_user, lambda: service.prime_count(n)
+    )
+
+
+@router.get("/factorize/{n}", response_model=MathResult)
+async def get_factorization(
+        n: int, current_user: str = Depends(verify_token),
+        service: MathService = Depends()
+):
+    """
+        Factorize a number into primes.
+
+        - **n**: integer from 2 to 2^64 - 1
+        - **Returns**: list of `[prime, exponent]` pairs
+    """
+    if n < 2 or n >= MAX_PRIME_INPUT:
+        raise HTTPException(400, "n must be between 2 and 2^64 - 1")
+    return await _run_cached(
+        "factorize", n, current_user, lambda: service.factorize(n)
+    )
+
+
+class CachedMathOperations:
+    """MathService operations for /eval. ``fibonacci`` and ``factorial``
+    share the Redis keys of the /fibonacci and /factorial endpoints;
+    ``power`` is cheap and is not cached."""
+
+    def __init__(self, service: MathService):
+        self.service = service
+
+    async def fibonacci(self, n: int) -> int:
+        return await run_cached("fibonacci", str(n), None,
+                                lambda: self.service.fibonacci(n),
+                                record=False)
+
+    async def factorial(self, n: int) -> int:
+        return await run_cached("factorial", str(n), None,
+                                lambda: self.service.factorial(n),
+                                record=False)
+
+    async def power(self, base, exponent):
+        return await self.service.power(base, exponent)
+
+
+@router.post("/eval", response_model=MathResult)
+async def evaluate_expression(
+        request: ExpressionRequest,
+        current_user: str = Depends(verify_token),
+        service: MathService = Depends()
+):
+    """
+        Evaluate an arithmetic expression in a single request.
+
+        - **expression**: numbers, `+ - * / **`, parentheses and calls to
+          `fib(n)`, `fact(n)` and `pow(x, y)`, e.g. `fact(pow(2, 3)) + 1`
+        - **Limits**: 1000 characters, 200 syntax nodes, intermediate
+          integers up to 10000 bits
+        - **Returns**: the value of the expression
+        - **Uses**: compiled-expression cache, Redis cache for `fib` / `fact`
+    """
+    start = time.perf_counter()
+    try:
+        compiled = compile_expression(request.expression)
+        result = await compiled(CachedMathOperations(service))
+    except ValueError as e:
+        # ExpressionError and MathService input errors alike
+        raise HTTPException(status_code=400, detail=str(e))
+    end = time.perf_counter()
+    print(f"Expression evaluation took {end - start:.4f} seconds")
+
+    await record_operation("eval", request.expression, result, current_user)
+
+    return MathResult(operation="eval", input=request.expression,
+                      result=result)
@@ -0,0 +1,213 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import status
+from routers.auth_router import decode_token
+from routers.pycalc_routers import (
+    MAX_FACTORIAL_N,
+    MAX_FIBONACCI_N,
+    MAX_POWER_OPERAND,
+)
+from routers.cached_operation import run_cached
+from services.pycalc_service import MathService
+
+try:
+    import msgpack
+except ImportError:  # MessagePack frames are optional
+    msgpack = None
+
+router = APIRouter()
+
+# Maximum number of calculations a single connection may have in flight.
+MAX_IN_FLIGHT = 32
+# How long a client without an Authorization header has to send its
+# `{"type": "auth", "token": ...}` frame.
+AUTH_TIMEOUT_SECONDS = 10
+
+
+class CalculationError(ValueError):
+    pass
+
+
+def _decode(message: dict) -> tuple:
+    """Return ``(request, binary)`` for a received WebSocket message."""
+    if message.get("bytes") is not None:
+        if msgpack is None:
+            raise CalculationError("MessagePack frames are not supported")
+        return msgpack.unpackb(message["bytes"], raw=False), True
+    return json.loads(message["text"]), False
+
+
+def _encode(payload: dict, binary: bool):
+    if binary:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _parse_request(request) -> tuple:
+    if not isinstance(request, dict):
+        raise CalculationError("Request must be an object")
+    op = request.get("op")
+    args = request.get("args", [])
+    if not isinstance(args, list):
+        args = [args]
+    if op in ("fibonacci", "factorial"):
+        if len(args) != 1 or not isinstance(args[0], int) \
+                or isinstance(args[0], bool) or args[0] < 0:
+            raise CalculationError(f"{op} expects one non-negative integer")
+        limit = MAX_FIBONACCI_N if op == "fibonacci" else MAX_FACTORIAL_N
+        if args[0] > limit:
+            raise CalculationError(
+                f"Input too large. Please use a value <= {limit}."
+            )
+        return op, args
+    if op in ("pow", "power"):
+        if len(args) != 2 or not all(
+                isinstance(a, (int, float)) and not isinstance(a, bool)
+                for a in args):
+            raise CalculationError("pow expects a base and an exponent")
+        x, y = float(args[0]), float(args[1])
+        if abs(x) > MAX_POWER_OPERAND or abs(y) > MAX_POWER_OPERAND:
+            raise CalculationError(
+                "Base and exponent must be between -100 and 100"
+            )
+        return "power", [x, y]
+    raise CalculationError(f"Unknown operation: {op}")
+
+
+async def calculate(op: str, args: list, user: str,
+                    service: MathService) -> dict:
+    """Run one calculation with the same cache, history and stream
+    side effects as the REST endpoints."""
+    if op == "power":
+        x, y = args
+        result = await run_cached(
+            op, f"{x}^{y}" if y != 1 else str(x), user,
+            lambda: service.power(x, y),
+            cache_key=f"power:{x}:{y}", history_operation="pow", loads=float
+        )
+        return {"operation": op, "input": {"base": x, "exponent": y},
+                "result": result}
+
+    n = args[0]
+    compute = service.factorial if op == "factorial" else service.fibonacci
+    result = await run_cached(op, str(n), user, lambda: compute(n))
+    return {"operation": op, "input": n, "result": result}
+
+
+def _header_token(websocket: WebSocket) -> Optional[str]:
+    header = websocket.headers.get("authorization", "")
+    scheme, _, credentials = header.partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        return None
+    return credentials
+
+
+async def _first_frame_token(websocket: WebSocket) -> str:
+    message = await asyncio.wait_for(websocket.receive(),
+                                     AUTH_TIMEOUT_SECONDS)
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect()
+    request, _ = _decode(message)
+    if not isinstance(request, dict) or request.get("type") != "auth" \
+            or not isinstance(request.get("token"), str):
+        raise HTTPException(status_code=401, detail="Missing token")
+    return request["token"]
+
+
+@router.websocket("/ws/calc")
+async def calculation_channel(websocket: WebSocket,
+                              token: Optional[str] = None):
+    """
+    Persistent calculation channel.
+
+    - **Auth**: `Authorization: Bearer <token>` header, checked once at
+      connect time. Clients that cannot set headers (browsers) send
+      `{"type": "auth", "token": <token>}` as their first frame and get
+      `{"type": "auth", "user": <username>}` back. A `?token=` query
+      parameter is still accepted but ends up in access logs.
+    - **Request**: `{"id": <tag>, "op": <name>, "args": [...]}` where
+      `op` is `fibonacci`, `factorial` or `pow`
+    - **Response**: `{"id": <tag>, "operation", "input", "result"}` or
+      `{"id": <tag>, "error": <detail>}`, in completion order
+    - **Encoding**: JSON text frames, or MessagePack binary frames when
+      `msgpack` is installed; replies use the encoding of the request
+    - **Flow control**: at most 32 requests in flight per connection
+    """
+    connect_token = _header_token(websocket) or token
+    if connect_token:
+        try:
+            current_user = decode_token(connect_token)
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION,
+                                  reason=e.detail)
+            return
+        await websocket.accept()
+    else:
+        await websocket.accept()
+        try:
+            current_user = decode_token(await _first_frame_token(websocket))
+        except WebSocketDisconnect:
+            return
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION,
+                                  reason=e.detail)
+            return
+        except (asyncio.TimeoutError, ValueError):
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION,
+                                  reason="Missing token")
+            return
+        await websocket.send_text(json.dumps(
+            {"type": "auth", "user": current_user}
+        ))
+    service = MathService()
+    window = asyncio.Semaphore(MAX_IN_FLIGHT)
+    send_lock = asyncio.Lock()
+    pending = set()
+
+    async def reply(payload: dict, binary: bool):
+        data = _encode(payload, binary)
+        async with send_lock:
+            if binary:
+                await websocket.send_bytes(data)
+            else:
+                await websocket.send_text(data)
+
+    async def handle(request, binary: bool):
+        tag = request.get("id") if isinstance(request, dict) else None
+        try:
+            op, args = _parse_request(request)
+            payload = await calculate(op, args, current_user, service)
+            payload = {"id": tag, **payload}
+        except (CalculationError, ValueError) as e:
+            payload = {"id": tag, "error": str(e)}
+        except Exception as e:
+            print(f"Error processing calculation {tag}: {e}")
+            payload = {"id": tag, "error": "Calculation failed"}
+        finally:
+            window.release()
+        await reply(payload, binary)
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            try:
+                request, binary = _decode(message)
+            except (CalculationError, ValueError) as e:
+                await reply({"id": None, "error": str(e)},
+                            message.get("bytes") is not None
+                            and msgpack is not None)
+                continue
+            # Blocks reading further frames once the window is full.
+            await window.acquire()
+            task = asyncio.create_task(handle(request, binary))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,258 @@
+import asyncio
+import math
+from decimal import Decimal, localcontext
+from typing import Iterator, List
+from services.prime_sieve import primes_up_to
+
+# Below this size a plain loop beats the recursion overhead of the tree.
+_PRODUCT_LEAF = 16
+# Digits per leaf chunk when streaming decimals; stays well below
+# Python's default int -> str conversion limit of 4300 digits.
+DECIMAL_CHUNK_DIGITS = 4096
+HEX_CHUNK_BYTES = 4096
+# Under these sizes digit counts are computed exactly from the number
+# itself, above them from Stirling / Binet with Decimal precision.
+_EXACT_DIGITS_FACTORIAL = 1000
+_EXACT_DIGITS_FIBONACCI = 1000
+_PI = Decimal(
+    "3.14159265358979323846264338327950288419716939937510582097494459"
+)
+
+
+def product_range(lo: int, hi: int) -> int:
+    """Product of the integers in ``[lo, hi)`` via a balanced product tree."""
+    if hi - lo <= _PRODUCT_LEAF:
+        result = 1
+        for i in range(lo, hi):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return product_range(lo, mid) * product_range(mid, hi)
+
+
+def _product_list(values: List[int], lo: int, hi: int) -> int:
+    if hi - lo <= _PRODUCT_LEAF:
+        result = 1
+        for i in range(lo, hi):
+            result *= values[i]
+        return result
+    mid = (lo + hi) // 2
+    return _product_list(values, lo, mid) * _product_list(values, mid, hi)
+
+
+def binary_split_factorial(n: int) -> int:
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if n < 2:
+        return 1
+    return product_range(2, n + 1)
+
+
+def _swing(n: int, primes: List[int]) -> int:
+    """Swinging factorial n! / (n // 2)! ** 2 as a product of prime powers."""
+    root = math.isqrt(n)
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        if p > root:
+            if (n // p) & 1:
+                factors.append(p)
+        else:
+            q, exponent = n, 0
+            while q:
+                q //= p
+                exponent += q & 1
+            if exponent:
+                factors.append(p ** exponent)
+    return _product_list(factors, 0, len(factors))
+
+
+def prime_swing_factorial(n: int) -> int:
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    primes = primes_up_to(n)
+
+    def recurse(k: int) -> int:
+        if k < 2:
+            return 1
+        half = recurse(k // 2)
+        return half * half * _swing(k, primes)
+
+    return recurse(n)
+
+
+def _fibonacci_pair(n: int, modulus: int = 0):
+    """Return ``(F(n), F(n + 1))`` by fast doubling, optionally reduced
+    mod ``modulus``."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if modulus:
+            c %= modulus
+            d %= modulus
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+        if modulus:
+            b %= modulus
+    return a, b
+
+
+def fast_doubling_fibonacci(n: int) -> int:
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    return _fibonacci_pair(n)[0]
+
+
+def _decimal_digits(value: int) -> int:
+    """Exact number of decimal digits of a non-negative integer."""
+    if value < 10:
+        return 1
+    # bit_length gives an estimate that is off by at most one.
+    digits = int((value.bit_length() - 1) * math.log10(2)) + 1
+    if value >= 10 ** digits:
+        digits += 1
+    return digits
+
+
+def factorial_digits(n: int) -> int:
+    """Number of decimal digits of ``n!`` without computing ``n!``."""
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if n < _EXACT_DIGITS_FACTORIAL:
+        return _decimal_digits(binary_split_factorial(n))
+    with localcontext() as ctx:
+        ctx.prec = 60
+        big_n = Decimal(n)
+        # Stirling series; the truncated terms are far below 1e-20 here.
+        ln_factorial = (
+            (big_n + Decimal("0.5")) * big_n.ln() - big_n
+            + (2 * _PI).ln() / 2
+            + 1 / (12 * big_n) - 1 / (360 * big_n ** 3)
+        )
+        return int(ln_factorial / Decimal(10).ln()) + 1
+
+
+def fibonacci_digits(n: int) -> int:
+    """Number of decimal digits of ``F(n)`` without computing ``F(n)``."""
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if n < _EXACT_DIGITS_FIBONACCI:
+        return _decimal_digits(fast_doubling_fibonacci(n))
+    with localcontext() as ctx:
+        ctx.prec = 60
+        sqrt5 = Decimal(5).sqrt()
+        phi = (1 + sqrt5) / 2
+        log10_fib = n * phi.log10() - sqrt5.log10()
+        return int(log10_fib) + 1
+
+
+def factorial_mod(n: int, modulus: int) -> int:
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if modulus < 1:
+        raise ValueError("modulus must be a positive integer")
+    if n >= modulus:
+        return 0
+    result = 1 % modulus
+    for i in range(2, n + 1):
+        result = result * i % modulus
+        if not result:
+            break
+    return result
+
+
+def fibonacci_mod(n: int, modulus: int) -> int:
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if modulus < 1:
+        raise ValueError("modulus must be a positive integer")
+    return _fibonacci_pair(n, modulus)[0] % modulus
+
+
+def factorial_trailing_zeros(n: int) -> int:
+    """Trailing decimal zeros of ``n!`` (Legendre's formula for p = 5)."""
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    zeros = 0
+    while n:
+        n //= 5
+        zeros += n
+    return zeros
+
+
+def _decimal_pieces(value: int, powers: List[int], level: int, pad: bool,
+                    width: int) -> Iterator[str]:
+    if level < 0:
+        text = str(value)
+        yield text.zfill(width) if pad else text
+        return
+    high, low = divmod(value, powers[level])
+    if high or pad:
+        yield from _decimal_pieces(high, powers, level - 1, pad, width)
+        yield from _decimal_pieces(low, powers, level - 1, True, width)
+    else:
+        yield from _decimal_pieces(low, powers, level - 1, False, width)
+
+
+def iter_decimal_chunks(value: int,
+                        chunk_digits: int = DECIMAL_CHUNK_DIGITS
+                        ) -> Iterator[str]:
+    """
+    Yield the decimal representation of a non-negative integer in chunks.
+
+    The number is split recursively by squared powers of ten, so the full
+    string is never built and no single ``str()`` call exceeds
+    ``chunk_digits`` digits.
+    """
+    if value < 0:
+        raise ValueError("value must be a non-negative integer")
+    powers = [10 ** chunk_digits]
+    while powers[-1] <= value:
+        powers.append(powers[-1] * powers[-1])
+    yield from _decimal_pieces(value, powers, len(powers) - 2, False,
+                               chunk_digits)
+
+
+def iter_hex_chunks(value: int,
+                    chunk_bytes: int = HEX_CHUNK_BYTES) -> Iterator[str]:
+    """Yield the lowercase hex representation of ``value`` in chunks."""
+    if value < 0:
+        raise ValueError("value must be a non-negative integer")
+    if value == 0:
+        yield "0"
+        return
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    for offset in range(0, len(raw), chunk_bytes):
+        text = raw[offset:offset + chunk_bytes].hex()
+        yield text.lstrip("0") if offset == 0 else text
+
+
+class BigNumberService:
+    """Large-number engine; CPU-heavy work runs off the event loop."""
+
+    async def factorial(self, n: int, algorithm: str = "split") -> int:
+        if algorithm == "swing":
+            return await asyncio.to_thread(prime_swing_factorial, n)
+        return await asyncio.to_thread(binary_split_factorial, n)
+
+    async def fibonacci(self, n: int) -> int:
+        return await asyncio.to_thread(fast_doubling_fibonacci, n)
+
+    async def factorial_digits(self, n: int) -> int:
+        return await asyncio.to_thread(factorial_digits, n)
+
+    async def fibonacci_digits(self, n: int) -> int:
+        return await asyncio.to_thread(fibonacci_digits, n)
+
+    async def factorial_mod(self, n: int, modulus: int) -> int:
+        return await asyncio.to_thread(factorial_mod, n, modulus)
+
+    async def fibonacci_mod(self, n: int, modulus: int) -> int:
+        return await asyncio.to_thread(fibonacci_mod, n, modulus)
+
+    async def factorial_trailing_zeros(self, n: int) -> int:
+        return factorial_trailing_zeros(n)
@@ -0,0 +1,186 @@
+import ast
+import math
+from functools import lru_cache
+from typing import Awaitable, Callable, Union
+
+Number = Union[int, float]
+# A compiled expression: awaits the math operations object it is given.
+Compiled = Callable[[object], Awaitable[Number]]
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPRESSION_NODES = 200
+# Keeps every intermediate integer (and the JSON response) well below
+# Python's 4300 digit int -> str limit.
+MAX_RESULT_BITS = 10000
+COMPILED_CACHE_SIZE = 512
+
+_LOG2_PHI = math.log2((1 + math.sqrt(5)) / 2)
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_FUNCTION_ARITY = {"fib": 1, "fact": 1, "pow": 2}
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def normalize_expression(expression: str) -> str:
+    return " ".join(expression.split())
+
+
+def _check_size(value: Number) -> Number:
+    if isinstance(value, int):
+        if value.bit_length() > MAX_RESULT_BITS:
+            raise ExpressionError(
+                f"Intermediate result exceeds {MAX_RESULT_BITS} bits"
+            )
+    elif isinstance(value, complex):
+        # e.g. (-8) ** 0.5
+        raise ExpressionError("Result is not a real number")
+    elif not math.isfinite(value):
+        raise ExpressionError("Result is not a finite number")
+    return value
+
+
+def _index(value: Number, name: str) -> int:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if not isinstance(value, int) or value < 0:
+        raise ExpressionError(f"{name} expects a non-negative integer")
+    return value
+
+
+async def _power(ops, base: Number, exponent: Number) -> Number:
+    if isinstance(base, int) and isinstance(exponent, int) \
+            and exponent > 0 and abs(base) > 1 \
+            and (abs(base).bit_length() - 1) * exponent > MAX_RESULT_BITS:
+        raise ExpressionError(
+            f"Intermediate result exceeds {MAX_RESULT_BITS} bits"
+        )
+    try:
+        return _check_size(await ops.power(base, exponent))
+    except OverflowError:
+        raise ExpressionError("Result is not a finite number")
+
+
+async def _fibonacci(ops, n: Number) -> int:
+    n = _index(n, "fib")
+    # The integer bound keeps huge n away from float math (OverflowError).
+    if n > 2 * MAX_RESULT_BITS or n * _LOG2_PHI > MAX_RESULT_BITS:
+        raise ExpressionError(f"fib({n}) exceeds {MAX_RESULT_BITS} bits")
+    return await ops.fibonacci(n)
+
+
+async def _factorial(ops, n: Number) -> int:
+    n = _index(n, "fact")
+    if n > 2 * MAX_RESULT_BITS \
+            or math.lgamma(n + 1) / math.log(2) > MAX_RESULT_BITS:
+        raise ExpressionError(f"fact({n}) exceeds {MAX_RESULT_BITS} bits")
+    return await ops.factorial(n)
+
+
+def _apply(operator: ast.operator, left: Number, right: Number) -> Number:
+    try:
+        if isinstance(operator, ast.Add):
+            return _check_size(left + right)
+        if isinstance(operator, ast.Sub):
+            return _check_size(left - right)
+        if isinstance(operator, ast.Mult):
+            return _check_size(left * right)
+        return _check_size(left / right)
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero")
+    except OverflowError:
+        raise ExpressionError("Result is not a finite number")
+
+
+def _compile_node(node: ast.AST) -> Compiled:
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ExpressionError("Only numeric constants are allowed")
+        _check_size(value)
+
+        async def constant(ops):
+            return value
+        return constant
+
+    if isinstance(node, ast.UnaryOp) \
+            and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _compile_node(node.operand)
+        sign = -1 if isinstance(node.op, ast.USub) else 1
+
+        async def unary(ops):
+            return sign * await operand(ops)
+        return unary
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, _BINARY_OPERATORS):
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+        operator = node.op
+        if isinstance(operator, ast.Pow):
+            async def power(ops):
+                return await _power(ops, await left(ops), await right(ops))
+            return power
+
+        async def binary(ops):
+            return _apply(operator, await left(ops), await right(ops))
+        return binary
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+            and node.func.id in _FUNCTION_ARITY and not node.keywords:
+        name = node.func.id
+        if len(node.args) != _FUNCTION_ARITY[name]:
+            raise ExpressionError(
+                f"{name} takes {_FUNCTION_ARITY[name]} argument(s)"
+            )
+        args = [_compile_node(arg) for arg in node.args]
+        if name == "pow":
+            async def call_pow(ops):
+                return await _power(ops, await args[0](ops),
+                                    await args[1](ops))
+            return call_pow
+        function = _fibonacci if name == "fib" else _factorial
+
+        async def call(ops):
+            return await function(ops, await args[0](ops))
+        return call
+
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def _check_length(expression: str):
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(
+            f"Expression longer than {MAX_EXPRESSION_LENGTH} characters"
+        )
+
+
+def parse_expression(expression: str) -> Compiled:
+    """Parse and validate an expression and compile it to a closure.
+
+    The closure takes an object with async ``fibonacci``, ``factorial``
+    and ``power`` methods, such as ``MathService``.
+    """
+    _check_length(expression)
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ExpressionError("Invalid expression")
+    if sum(1 for _ in ast.walk(tree)) > MAX_EXPRESSION_NODES:
+        raise ExpressionError("Expression is too complex")
+    try:
+        return _compile_node(tree.body)
+    except RecursionError:
+        raise ExpressionError("Expression is too complex")
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile_normalized(expression: str) -> Compiled:
+    return parse_expression(expression)
+
+
+def compile_expression(expression: str) -> Compiled:
+    """``parse_expression`` with an LRU cache keyed by normalized text."""
+    # Checked before normalizing so oversized input is never split.
+    _check_length(expression)
+    return _compile_normalized(normalize_expression(expression))
@@ -0,0 +1,220 @@
+import math
+import os
+import threading
+from typing import List, Tuple
+
+# Numbers covered by one sieve segment; must be a multiple of 16 so a
+# segment packs into whole bytes (one bit per odd number).
+SEGMENT_SIZE = 1 << 20
+MAX_SIEVE_LIMIT = int(os.getenv("PRIME_SIEVE_MAX_LIMIT", "100000000"))
+# Deterministic Miller-Rabin bases, valid for n < 3.3e24.
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MAX_MILLER_RABIN_INPUT = 3317044064679887385961981
+# Trial division bound used by factorize before switching to Pollard rho.
+_TRIAL_DIVISION_LIMIT = 1 << 16
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def primes_up_to(n: int) -> List[int]:
+    """All primes ``<= n`` from a plain (unsegmented) sieve."""
+    if n < 2:
+        return []
+    flags = bytearray([1]) * (n + 1)
+    flags[0] = flags[1] = 0
+    for p in range(2, math.isqrt(n) + 1):
+        if flags[p]:
+            flags[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [i for i, is_prime in enumerate(flags) if is_prime]
+
+
+def miller_rabin(n: int) -> bool:
+    """Deterministic Miller-Rabin test for ``n < 3.3e24``."""
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_brent(n: int) -> int:
+    """Return a non-trivial factor of the odd composite ``n``."""
+    for c in range(1, n):
+        y, r, q, g = 2, 1, 1, 1
+        m = 128
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ValueError(f"Could not factor {n}")
+
+
+class PrimeSieve:
+    """
+    Segmented Sieve of Eratosthenes stored as a bitarray of odd numbers.
+
+    The sieve grows one segment at a time up to ``max_limit`` and is shared
+    between requests; growth is serialized by a lock, while lookups only
+    read segments that are already complete.
+    """
+
+    def __init__(self, max_limit: int = MAX_SIEVE_LIMIT):
+        self.max_limit = max_limit
+        self._bits = bytearray()
+        self._segment_counts = []
+        self._limit = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """All numbers below this value are covered by the sieve."""
+        return self._limit
+
+    def _sieve_segment(self, lo: int):
+        hi = lo + SEGMENT_SIZE
+        # flags[j] stands for the odd number lo + 2 * j + 1.
+        flags = bytearray([1]) * (SEGMENT_SIZE // 2)
+        if lo == 0:
+            flags[0] = 0
+        for p in primes_up_to(math.isqrt(hi))[1:]:
+            start = max(p * p, (lo + p) // p * p)
+            if start % 2 == 0:
+                start += p
+            j = (start - lo - 1) // 2
+            flags[j::p] = bytes(len(range(j, len(flags), p)))
+        packed = int(flags.translate(_BIT_CHARS)[::-1], 2)
+        self._bits += packed.to_bytes(SEGMENT_SIZE // 16, "little")
+        self._segment_counts.append(packed.bit_count())
+        self._limit = hi
+
+    def ensure(self, limit: int):
+        """Grow the sieve so it covers every number below ``limit``."""
+        if limit <= self._limit:
+            return
+        if limit > self.max_limit:
+            raise ValueError(
+                f"Sieve limit {self.max_limit} exceeded; use a smaller input"
+            )
+        with self._lock:
+            while self._limit < limit:
+                self._sieve_segment(self._limit)
+
+    def _bit(self, index: int) -> int:
+        return self._bits[index >> 3] >> (index & 7) & 1
+
+    def is_prime(self, n: int) -> bool:
+        if n < 2:
+            return False
+        if n % 2 == 0:
+            return n == 2
+        if n < self._limit:
+            return bool(self._bit(n // 2))
+        if n < MAX_MILLER_RABIN_INPUT:
+            return miller_rabin(n)
+        raise ValueError("n is too large for a deterministic primality test")
+
+    def prime_count(self, n: int) -> int:
+        """Number of primes ``<= n``."""
+        if n < 2:
+            return 0
+        self.ensure(n + 1)
+        odd_count = (n + 1) // 2
+        bits_per_segment = SEGMENT_SIZE // 2
+        full = odd_count // bits_per_segment
+        count = 1 + sum(self._segment_counts[:full])
+        start = full * bits_per_segment
+        remaining = odd_count - start
+        if remaining:
+            start_byte = start // 8
+            chunk = self._bits[start_byte:start_byte + (remaining + 7) // 8]
+            tail = int.from_bytes(chunk, "little") & ((1 << remaining) - 1)
+            count += tail.bit_count()
+        return count
+
+    def nth_prime(self, n: int) -> int:
+        """The n-th prime, counting from ``nth_prime(1) == 2``."""
+        if n < 1:
+            raise ValueError("n must be a positive integer")
+        if n == 1:
+            return 2
+        if n < 6:
+            bound = 13
+        else:
+            bound = int(n * (math.log(n) + math.log(math.log(n)))) + 1
+        self.ensure(bound + 1)
+
+        remaining = n - 1
+        for segment, count in enumerate(self._segment_counts):
+            if remaining <= count:
+                break
+            remaining -= count
+        size = SEGMENT_SIZE // 16
+        chunk = self._bits[segment * size:(segment + 1) * size]
+        bits = format(int.from_bytes(chunk, "little"), f"0{size * 8}b")[::-1]
+        position = -1
+        for _ in range(remaining):
+            position = bits.index("1", position + 1)
+        return segment * SEGMENT_SIZE + 2 * position + 1
+
+    def factorize(self, n: int) -> List[Tuple[int, int]]:
+        """Prime factorization as ``[(prime, exponent), ...]``."""
+        if n < 2:
+            raise ValueError("n must be an integer greater than 1")
+        self.ensure(_TRIAL_DIVISION_LIMIT + 1)
+        factors = {}
+        for p in self._primes_below(min(math.isqrt(n),
+                                        _TRIAL_DIVISION_LIMIT) + 1):
+            while n % p == 0:
+                factors[p] = factors.get(p, 0) + 1
+                n //= p
+            if p * p > n:
+                break
+        pending = [n] if n > 1 else []
+        while pending:
+            m = pending.pop()
+            if self.is_prime(m):
+                factors[m] = factors.get(m, 0) + 1
+            else:
+                d = _pollard_brent(m)
+                pending.extend((d, m // d))
+        return sorted(factors.items())
+
+    def _primes_below(self, limit: int):
+        if limit > 2:
+            yield 2
+        for n in range(3, min(limit, self._limit), 2):
+            if self._bit(n // 2):
+                yield n
+
+
+prime_sieve = PrimeSieve()
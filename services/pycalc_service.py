@@ -1,26 +1,36 @@
+import asyncio
+from typing import List, Tuple
+from services.bignum_service import (
+    binary_split_factorial,
+    fast_doubling_fibonacci,
+)
+from services.prime_sieve import prime_sieve
+
+
 class MathService:
     async def factorial(self, n: int) -> int:
         if n < 0:
             raise ValueError("n must be a non-negative integer")
-        result = 1
-        for i in range(2, n + 1):
-            result *= i
-        return result
+        return binary_split_factorial(n)
 
     async def fibonacci(self, n: int) -> int:
         if n < 0:
             raise ValueError("n must be a non-negative integer")
-        elif n == 0:
-            return 0
-        elif n == 1:
-            return 1
-        else:
-            a, b = 0, 1
-            for _ in range(2, n + 1):
-                a, b = b, a + b
-            return b
+        return fast_doubling_fibonacci(n)
 
     async def power(self, base: float, exponent: float) -> float:
         if exponent < 0:
             raise ValueError("exponent must be a non-negative number")
         return base ** exponent
+
+    async def is_prime(self, n: int) -> bool:
+        return await asyncio.to_thread(prime_sieve.is_prime, n)
+
+    async def nth_prime(self, n: int) -> int:
+        return await asyncio.to_thread(prime_sieve.nth_prime, n)
+
+    async def prime_count(self, n: int) -> int:
+        return await asyncio.to_thread(prime_sieve.prime_count, n)
+
+    async def factorize(self, n: int) -> List[Tuple[int, int]]:
+        return await asyncio.to_thread(prime_sieve.factorize, n)
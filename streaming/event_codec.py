@@ -0,0 +1,156 @@
+import json
+import struct
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+JSON_CONTENT_TYPE = "application/json"
+BINARY_CONTENT_TYPE = "application/x-pycalc-event"
+BINARY_SCHEMA_VERSION = 1
+
+# version, flags, event id, timestamp (us since epoch), operation code,
+# then the byte lengths of operation name, user, input and result.
+_HEADER = struct.Struct(">BB16sqBBHHI")
+_FLAG_CACHED = 0x01
+# Bits 1-2 of the flags hold the result type so decoding is lossless.
+# Consumers that ignore them simply read the result as a string.
+_RESULT_TYPE_SHIFT = 1
+_RESULT_TYPE_MASK = 0x06
+_RESULT_STR, _RESULT_INT, _RESULT_FLOAT = 0, 1, 2
+_RESULT_PARSERS = {_RESULT_STR: str, _RESULT_INT: int, _RESULT_FLOAT: float}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Operation codes of schema version 1: an operation's wire code is its
+# position + 1, so entries must never be reordered or removed. Operations
+# added since go by name with code 0 until the schema version is bumped,
+# so consumers built against version 1 can still decode them.
+OPERATION_CODES = [
+    "fibonacci",
+    "factorial",
+    "power",
+    "fibonacci_full",
+    "fibonacci_digits",
+    "fibonacci_mod",
+    "factorial_full",
+    "factorial_digits",
+    "factorial_mod",
+    "factorial_zeros",
+]
+_CODE_BY_OPERATION = {op: i + 1 for i, op in enumerate(OPERATION_CODES)}
+_EVENT_KEYS = {"operation", "input", "result", "cached_result", "timestamp",
+               "user", "event_id"}
+
+
+class UnsupportedEventError(ValueError):
+    """The event uses a binary schema version this consumer cannot read."""
+
+
+def _encode_binary(message: dict) -> bytes:
+    cached = "cached_result" in message
+    result = message["cached_result" if cached else "result"]
+    if isinstance(result, bool):
+        raise TypeError("Boolean results are sent as JSON")
+    if isinstance(result, int):
+        result_type = _RESULT_INT
+    elif isinstance(result, float):
+        result_type = _RESULT_FLOAT
+    elif isinstance(result, str):
+        result_type = _RESULT_STR
+    else:
+        raise TypeError("Only str, int and float results fit the schema")
+    result = repr(result) if result_type == _RESULT_FLOAT else str(result)
+    operation = message["operation"]
+    code = _CODE_BY_OPERATION.get(operation, 0)
+    name = b"" if code else operation.encode("utf-8")
+    user = str(message["user"]).encode("utf-8")
+    input_data = str(message["input"]).encode("utf-8")
+    result_data = result.encode("utf-8")
+    timestamp = datetime.fromisoformat(message["timestamp"])
+    header = _HEADER.pack(
+        BINARY_SCHEMA_VERSION,
+        (_FLAG_CACHED if cached else 0)
+        | result_type << _RESULT_TYPE_SHIFT,
+        bytes.fromhex(message["event_id"]),
+        (timestamp - _EPOCH) // _MICROSECOND,
+        code,
+        len(name), len(user), len(input_data), len(result_data)
+    )
+    return b"".join((header, name, user, input_data, result_data))
+
+
+# Events arrive close together, so the ISO prefix of the last second seen
+# is reused instead of building a datetime per event.
+_last_second = (None, "")
+
+
+def _format_timestamp(micros: int) -> str:
+    """Same output as ``datetime.isoformat()`` for a naive UTC timestamp."""
+    global _last_second
+    second, fraction = divmod(micros, 1000000)
+    cached_second, prefix = _last_second
+    if cached_second != second:
+        prefix = (_EPOCH + timedelta(seconds=second)).isoformat()
+        _last_second = (second, prefix)
+    return f"{prefix}.{fraction:06d}" if fraction else prefix
+
+
+def _decode_binary(data: bytes) -> dict:
+    (version, flags, event_id, timestamp, code,
+     name_len, user_len, input_len, result_len) = _HEADER.unpack_from(data)
+    if version != BINARY_SCHEMA_VERSION:
+        raise UnsupportedEventError(
+            f"Unsupported event schema version: {version}"
+        )
+    offset = _HEADER.size
+    fields = []
+    for length in (name_len, user_len, input_len, result_len):
+        fields.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    name, user, input_data, result = fields
+    result_type = (flags & _RESULT_TYPE_MASK) >> _RESULT_TYPE_SHIFT
+    if 0 < code <= len(OPERATION_CODES):
+        operation = OPERATION_CODES[code - 1]
+    else:
+        operation = name or f"unknown_{code}"
+    return {
+        "operation": operation,
+        "input": input_data,
+        "cached_result" if flags & _FLAG_CACHED else "result":
+            _RESULT_PARSERS.get(result_type, str)(result),
+        "timestamp": _format_timestamp(timestamp),
+        "user": user,
+        "event_id": event_id.hex(),
+    }
+
+
+def encode_event(message: dict, encoding: str = "binary"
+                 ) -> Tuple[bytes, dict]:
+    """
+    Encode an operation event for Pub/Sub.
+
+    Returns the payload and the message attributes. Events that do not
+    fit the binary schema are sent as JSON, so they are never dropped.
+    """
+    data = None
+    if encoding == "binary" and set(message) <= _EVENT_KEYS:
+        try:
+            data = _encode_binary(message)
+            attributes = {
+                "content_type": BINARY_CONTENT_TYPE,
+                "schema_version": str(BINARY_SCHEMA_VERSION),
+            }
+        except (KeyError, TypeError, ValueError, struct.error):
+            data = None
+    if data is None:
+        data = json.dumps(message).encode("utf-8")
+        attributes = {"content_type": JSON_CONTENT_TYPE}
+    if "event_id" in message:
+        attributes["event_id"] = message["event_id"]
+    return data, attributes
+
+
+def decode_event(data: bytes, content_type: Optional[str] = None) -> dict:
+    """Decode an event; a missing content type means legacy JSON."""
+    if content_type == BINARY_CONTENT_TYPE:
+        return _decode_binary(data)
+    return json.loads(data.decode("utf-8"))
@@ -0,0 +1,38 @@
+import threading
+from collections import OrderedDict
+
+
+class RecentEventIds:
+    """
+    Bounded LRU set of event ids already processed.
+
+    Pub/Sub delivers at least once, so the same event can arrive more than
+    once. Only the last ``maxlen`` ids are remembered, which keeps memory
+    flat while covering the usual redelivery window.
+    """
+
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, event_id: str) -> bool:
+        """
+        Reserve ``event_id`` for processing.
+
+        Returns False if the id was already claimed, so concurrent
+        redeliveries of one event cannot both be processed.
+        """
+        with self._lock:
+            if event_id in self._ids:
+                self._ids.move_to_end(event_id)
+                return False
+            self._ids[event_id] = None
+            if len(self._ids) > self.maxlen:
+                self._ids.popitem(last=False)
+            return True
+
+    def release(self, event_id: str):
+        """Forget a claimed id, e.g. after processing failed."""
+        with self._lock:
+            self._ids.pop(event_id, None)
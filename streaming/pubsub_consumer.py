@@ -1,7 +1,8 @@
 from google.cloud import pubsub_v1
 import os
-import json
 import time
+from streaming.event_codec import UnsupportedEventError, decode_event
+from streaming.event_dedup import RecentEventIds
 from streaming.kafka_storage import add_kafka_message
 
 project_id = os.getenv("GCP_PROJECT_ID", "amiable-octane-468912-t1")
@@ -10,15 +11,33 @@ subscription_id = "operation-sub"
 subscriber = pubsub_v1.SubscriberClient()
 subscription_path = subscriber.subscription_path(project_id, subscription_id)
 
+recent_event_ids = RecentEventIds(
+    maxlen=int(os.getenv("EVENT_DEDUP_WINDOW", "10000"))
+)
+
 
 def callback(message):
+    event_id = None
     try:
-        data = json.loads(message.data.decode("utf-8"))
+        attributes = message.attributes or {}
+        event_id = attributes.get("event_id")
+        if event_id and not recent_event_ids.claim(event_id):
+            print(f"Skipping duplicate message: {event_id}")
+            message.ack()
+            return
+        data = decode_event(message.data, attributes.get("content_type"))
         add_kafka_message(data)
         print(f"Received message: {data}")
         message.ack()
+    except UnsupportedEventError as e:
+        # Redelivery cannot help; drop it instead of looping forever.
+        print(f"Dropping message: {e}")
+        message.ack()
     except Exception as e:
         print(f"Error processing message: {e}")
+        # Let the redelivered copy be processed again.
+        if event_id:
+            recent_event_ids.release(event_id)
         message.nack()
 
 
@@ -1,14 +1,18 @@
 import os
-import json
+import uuid
 from google.cloud import pubsub_v1
+from streaming.event_codec import encode_event
 
 project_id = os.getenv("GCP_PROJECT_ID", "amiable-octane-468912-t1")
 topic_id = "operation_stream"
+# "json" until every consumer understands the binary format, then "binary".
+event_encoding = os.getenv("EVENT_ENCODING", "json")
 
 publisher = pubsub_v1.PublisherClient()
 topic_path = publisher.topic_path(project_id, topic_id)
 
 def send_message(message: dict):
-    data = json.dumps(message).encode("utf-8")
-    future = publisher.publish(topic_path, data)
+    message = {**message, "event_id": uuid.uuid4().hex}
+    data, attributes = encode_event(message, event_encoding)
+    future = publisher.publish(topic_path, data, **attributes)
     future.result()
@@ -83,6 +83,105 @@ async def test_use_token_to_call_ops():
         assert response.json()["result"] == 8
 
 
+@pytest.mark.asyncio
+async def test_prime_ops():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+            transport=transport,
+            base_url="http://test"
+    ) as client:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        response = await client.get("/is-prime/1000003", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["result"] is True
+
+        response = await client.get("/nth-prime/1000", headers=headers)
+        assert response.json()["result"] == 7919
+
+        response = await client.get("/prime-count/100", headers=headers)
+        assert response.json()["result"] == 25
+
+        response = await client.get("/factorize/360", headers=headers)
+        assert response.json()["result"] == [[2, 3], [3, 2], [5, 1]]
+
+        response = await client.get(f"/is-prime/{2 ** 64}", headers=headers)
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_eval_expression():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+            transport=transport,
+            base_url="http://test"
+    ) as client:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        response = await client.post("/eval", headers=headers, json={
+            "expression": "fact(pow(2, 3)) + fib(10) * 2"
+        })
+        assert response.status_code == 200
+        assert response.json()["result"] == 40430
+
+        for expression in ["__import__('os')", "1 / 0", "2 ** 100000",
+                           "fact(5000)", "fib(-1)", "(-8) ** 0.5",
+                           "pow(-8, 0.5)", "fact(2**1100)", "fib(2**1100)"]:
+            response = await client.post("/eval", headers=headers, json={
+                "expression": expression
+            })
+            assert response.status_code == 400
+
+        response = await client.post("/eval", headers=headers, json={
+            "expression": "1" + " " * 2000
+        })
+        assert response.status_code == 422
+
+
+def test_compiled_expression_cache():
+    from services.expression_service import compile_expression
+    assert compile_expression("1 +  2*fib(3)") is \
+        compile_expression(" 1 + 2*fib(3) ")
+    with pytest.raises(ValueError):
+        compile_expression("1" + " " * 2000)
+
+
+def test_prime_sieve_beyond_limit():
+    from services.prime_sieve import PrimeSieve, SEGMENT_SIZE
+    sieve = PrimeSieve(max_limit=SEGMENT_SIZE)
+    assert sieve.prime_count(SEGMENT_SIZE - 1) == 82025
+    assert sieve.is_prime(2 ** 61 - 1)
+    assert not sieve.is_prime(4294967291 * 4294967279)
+    assert sieve.factorize(4294967291 * 4294967279) == \
+        [(4294967279, 1), (4294967291, 1)]
+    with pytest.raises(ValueError):
+        sieve.nth_prime(1_000_000)
+
+
+def test_websocket_pipelined_ops():
+    from fastapi.testclient import TestClient
+    client = TestClient(app)
+    with client.websocket_connect("/ws/calc", headers={
+            "Authorization": f"Bearer {user_token}"}) as ws:
+        ws.send_json({"id": "a", "op": "fibonacci", "args": [10]})
+        ws.send_json({"id": "b", "op": "factorial", "args": [5]})
+        ws.send_json({"id": "c", "op": "pow", "args": [2, 3]})
+        ws.send_json({"id": "d", "op": "factorial", "args": [1000]})
+        replies = {}
+        for _ in range(4):
+            reply = ws.receive_json()
+            replies[reply["id"]] = reply
+    assert replies["a"]["result"] == 55
+    assert replies["b"]["result"] == 120
+    assert replies["c"]["result"] == 8
+    assert "error" in replies["d"]
+
+    # Clients that cannot set headers authenticate with their first frame.
+    with client.websocket_connect("/ws/calc") as ws:
+        ws.send_json({"type": "auth", "token": user_token})
+        assert ws.receive_json() == {"type": "auth", "user": "bogdan"}
+        ws.send_json({"id": 1, "op": "fibonacci", "args": [10]})
+        assert ws.receive_json()["result"] == 55
+
+
 @pytest.mark.asyncio
 async def test_secure_history():
     transport = ASGITransport(app=app)
@@ -142,6 +241,25 @@ async def test_admin_sees_all():
         assert len(response.json()["history"]) >= 1
 
 
+@pytest.mark.asyncio
+async def test_secure_history_aggregates():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+            transport=transport,
+            base_url="http://test"
+    ) as client:
+        for token, role in [(admin_token, "admin"), (user_token, "user")]:
+            response = await client.get("/secure-history/aggregates",
+                                        headers={
+                                            "Authorization": f"Bearer {token}"
+                                        })
+            assert response.status_code == 200
+            body = response.json()
+            assert set(body) == {"user", "role", "history"}
+            assert body["role"] == role
+            assert isinstance(body["history"], list)
+
+
 @pytest.mark.asyncio
 async def test_delete_user():
     transport = ASGITransport(app=app)
@@ -166,3 +284,120 @@ async def test_token_invalid_after_delete():
             "Authorization": f"Bearer {user_token}"
         })
         assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_big_number_engine():
+    import math
+    import sys
+    from services.bignum_service import (
+        BigNumberService,
+        iter_decimal_chunks,
+        iter_hex_chunks,
+    )
+    service = BigNumberService()
+
+    expected = math.factorial(3000)
+    assert await service.factorial(3000) == expected
+    assert await service.factorial(3000, "swing") == expected
+    assert "".join(iter_hex_chunks(expected, 7)) == format(expected, "x")
+    digits = "".join(iter_decimal_chunks(expected, 50))
+    assert len(digits) == await service.factorial_digits(3000)
+    # 3000! has 9131 digits, over the default int <-> str limit.
+    str_limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        assert digits == str(expected)
+    finally:
+        sys.set_int_max_str_digits(str_limit)
+
+    assert await service.factorial_trailing_zeros(100) == 24
+    assert await service.factorial_mod(20, 1_000_003) == \
+        math.factorial(20) % 1_000_003
+    assert await service.fibonacci(90) == 2880067194370816120
+    assert await service.fibonacci_digits(10_000) == 2090
+
+
+@pytest.mark.asyncio
+async def test_roll_up_old_operations(tmp_path, monkeypatch):
+    import db.db_connection
+    from db.db_maintenance import roll_up_operations, incremental_vacuum
+    monkeypatch.setattr(db.db_connection, "DB_FILE",
+                        str(tmp_path / "operations.db"))
+    await init_db()
+
+    conn = await db.db_connection.get_db()
+    await conn.executemany(
+        "INSERT INTO operations "
+        "(operation, input, result, timestamp, user_id) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [("fibonacci", "10", "55", "2020-01-01 10:00:00", 1),
+         ("fibonacci", "11", "89", "2020-01-01 11:00:00", 1),
+         ("factorial", "5", "120", "2020-01-02 10:00:00", 2),
+         ("pow", "2^3", "8", "2999-01-01 10:00:00", 1)]
+    )
+    await conn.commit()
+    await conn.close()
+
+    assert await roll_up_operations(retention_days=30, batch_size=2) == 3
+    await incremental_vacuum()
+
+    conn = await db.db_connection.get_db()
+    cursor = await conn.execute(
+        "SELECT day, user_id, operation, operation_count "
+        "FROM operations_daily ORDER BY day")
+    totals = await cursor.fetchall()
+    cursor = await conn.execute("SELECT operation FROM operations")
+    remaining = await cursor.fetchall()
+    await conn.close()
+
+    assert totals == [("2020-01-01", 1, "fibonacci", 2),
+                      ("2020-01-02", 2, "factorial", 1)]
+    assert remaining == [("pow",)]
+
+
+def test_event_codec_and_dedup():
+    from streaming.event_codec import encode_event, decode_event
+    from streaming.event_dedup import RecentEventIds
+    event = {
+        "operation": "factorial",
+        "input": "5",
+        "cached_result": "120",
+        "timestamp": "2025-01-01T10:00:00.000123",
+        "user": "bogdan",
+        "event_id": "0123456789abcdef0123456789abcdef"
+    }
+    data, attributes = encode_event(event, "binary")
+    assert attributes["content_type"] == "application/x-pycalc-event"
+    assert attributes["event_id"] == event["event_id"]
+    assert decode_event(data, attributes["content_type"]) == event
+
+    data, attributes = encode_event(event, "json")
+    assert len(data) > len(encode_event(event, "binary")[0])
+    assert decode_event(data, attributes["content_type"]) == event
+    assert decode_event(data) == event
+
+    for result in [55, 2.5, "[[2, 3]]"]:
+        event = {**event, "result": result}
+        event.pop("cached_result", None)
+        data, attributes = encode_event(event, "binary")
+        decoded = decode_event(data, attributes["content_type"])
+        assert decoded == event
+        assert type(decoded["result"]) is type(result)
+
+    # Operations added after schema version 1 travel by name, and codes
+    # a consumer does not know fall back to that name.
+    data, _ = encode_event({**event, "operation": "eval"}, "binary")
+    assert data[26] == 0
+    data = data[:26] + bytes([200]) + data[27:]
+    assert decode_event(data, attributes["content_type"])["operation"] \
+        == "eval"
+
+    recent = RecentEventIds(maxlen=2)
+    assert recent.claim("a")
+    assert not recent.claim("a")
+    assert recent.claim("b")
+    recent.release("b")
+    assert recent.claim("b")
+    assert recent.claim("c")
+    assert recent.claim("a")